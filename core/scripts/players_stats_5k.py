@@ -1,10 +1,16 @@
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote_plus
 import csv
+import numpy as np
 import pandas as pd
 import os
 from datetime import date
 import time  # for retry delays
+import random  # for retry jitter
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Paths ----------------------------------------------------------
 
@@ -16,6 +22,37 @@ HISCORES_URL = "https://secure.runescape.com/m=hiscore_oldschool/index_lite.ws?p
 # NEW: where we store players that are no longer on hiscores
 DROPPED_PLAYERS_PATH = os.path.join(DATA_DIR, "dropped_players.csv")
 
+# --- HTTP session ---------------------------------------------------
+
+# Number of players fetched concurrently (also the connection pool size)
+MAX_WORKERS = 16
+
+# Requests allowed in flight at once across all workers (threads sleeping
+# in a retry backoff don't hold a slot)
+MAX_IN_FLIGHT = 8
+_RATE = threading.Semaphore(MAX_IN_FLIGHT)
+
+# Upper bound for a single retry delay (after jitter), in seconds
+MAX_RETRY_DELAY = 60
+
+# Rows written to the panel CSV at a time (progress kept if a run dies)
+BATCH_SIZE = 100
+
+# One keep-alive session for all hiscore requests, so each player
+# doesn't pay for a fresh TCP + TLS handshake.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=0),
+)
+_SESSION.headers.update({"User-Agent": "ThesisOSRS/1.0"})
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session (swap it out in tests)."""
+    return _SESSION
+
+
 SKILLS = [
     "overall",
     "attack",
@@ -115,6 +152,35 @@ BOSSES = [
     "zulrah",
 ]
 
+# Row counts used when slicing each hiscore response
+_SKILL_LEN = len(SKILLS)
+_BOSS_LEN = len(BOSSES)
+
+# Output column names, built once from SKILLS / BOSSES
+SKILL_COLS = [(s, f"{s}_level", f"{s}_xp", f"{s}_rank") for s in SKILLS]
+BOSS_COLS = [(b, f"{b}_kc", f"{b}_rank") for b in BOSSES]
+
+# Flat column lists (after player_name, date) in output order
+SKILL_COLUMNS = [col for _, *cols in SKILL_COLS for col in cols]
+BOSS_COLUMNS = [col for _, *cols in BOSS_COLS for col in cols]
+
+# Full panel CSV header, in the order rows are written
+HEADER_COLS = ["player_name", "date"] + SKILL_COLUMNS + BOSS_COLUMNS
+
+
+def retry_after_seconds(resp) -> float | None:
+    """Seconds from a 429 response's Retry-After header, if it gives any."""
+    if resp is None or resp.status_code != 429:
+        return None
+    try:
+        seconds = float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+    # Ignore nonsense like "inf", "nan" or negative values
+    if not math.isfinite(seconds) or seconds <= 0:
+        return None
+    return seconds
+
 
 def fetch_player_stats(player_name: str, max_retries: int = 5, base_delay: int = 3) -> dict:
     """Fetch OSRS hiscore stats + boss killcounts, with retries on transient errors."""
@@ -125,7 +191,8 @@ def fetch_player_stats(player_name: str, max_retries: int = 5, base_delay: int =
 
     for attempt in range(1, max_retries + 1):
         try:
-            resp = requests.get(url, timeout=10)
+            with _RATE:
+                resp = get_session().get(url, timeout=10)
 
             # Permanent error: player not on hiscores → do NOT retry
             if resp.status_code == 404:
@@ -148,10 +215,19 @@ def fetch_player_stats(player_name: str, max_retries: int = 5, base_delay: int =
                 )
                 raise
 
-            delay = base_delay * attempt
+            # Exponential backoff with jitter, so throttled workers don't
+            # all retry at the same moment
+            delay = base_delay * 2 ** (attempt - 1) * (0.5 + random.random())
+            delay = min(MAX_RETRY_DELAY, delay)
+
+            # When throttled, wait at least as long as the server asks,
+            # but never longer than MAX_RETRY_DELAY
+            retry_after = retry_after_seconds(e.response)
+            if retry_after is not None:
+                delay = min(MAX_RETRY_DELAY, max(delay, retry_after))
             print(
                 f"  [WARN] {player_name}: attempt {attempt}/{max_retries} failed "
-                f"({e}). Retrying in {delay}s..."
+                f"({e}). Retrying in {delay:.1f}s..."
             )
             time.sleep(delay)
 
@@ -160,19 +236,19 @@ def fetch_player_stats(player_name: str, max_retries: int = 5, base_delay: int =
 
     # --- Parse response text into stats dict ---
 
-    rows = list(csv.reader(text.strip().split("\n")))
+    # Plain "rank,level,xp" / "rank,kc" lines (no quoting), so a str.split
+    # is enough and cheaper than csv.reader
+    rows = [line.split(",") for line in text.split()]
     stats = {}
 
     # --- Skills ---
-    skill_rows = rows[: len(SKILLS)]
+    skill_rows = rows[:_SKILL_LEN]
     for skill, row in zip(SKILLS, skill_rows):
         r, lvl, xp = row
         stats[skill] = {"rank": int(r), "level": int(lvl), "xp": int(xp)}
 
     # --- Activities (last N rows = bosses) ---
-    activity_rows = rows[len(SKILLS):]
-    boss_count = len(BOSSES)
-    boss_rows = activity_rows[-boss_count:] if len(activity_rows) >= boss_count else []
+    boss_rows = rows[-_BOSS_LEN:] if len(rows) >= _SKILL_LEN + _BOSS_LEN else []
 
     boss_stats = {}
     for boss_name, row in zip(BOSSES, boss_rows):
@@ -211,87 +287,205 @@ def load_player_names(csv_path: str) -> list:
             f"Make sure players_list.csv exists in the data/ folder."
         )
 
-    df_raw = pd.read_csv(csv_path, header=None)
+    # Single pass over the file: sniff the first row, then read the rest
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        first = next(reader, [])
 
-    # Detect headered vs headerless format
-    if "player_name" in df_raw.iloc[0].values:
-        df = pd.read_csv(csv_path)
-        names = df["player_name"].astype(str).tolist()
-    else:
-        names = df_raw.iloc[:, 0].astype(str).tolist()
+        # Detect headered vs headerless format
+        if "player_name" in first:
+            col = first.index("player_name")
+            names = []
+        else:
+            col = 0
+            names = first[:1]
+
+        names.extend(row[col] for row in reader if len(row) > col)
 
-    return [n.strip() for n in names if isinstance(n, str) and n.strip()]
+    return [n.strip() for n in names if n.strip()]
 
 
 def load_dropped_players(path: str) -> set:
     """Load set of players we already know are not on hiscores anymore."""
     if not os.path.exists(path):
         return set()
-    df = pd.read_csv(path)
-    if 'player_name' not in df.columns:
-        return set()
-    return set(df['player_name'].astype(str))
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "player_name" not in reader.fieldnames:
+            return set()
+        return {row["player_name"] for row in reader if row["player_name"]}
+
+
+def append_dropped_players(path: str, player_names: list):
+    """Append dropped players to the dropped_players.csv file in one write."""
+    if not player_names:
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Header only when creating the file
+    file_exists = os.path.exists(path)
+    pd.DataFrame({'player_name': player_names}).to_csv(
+        path, index=False, mode="a", header=not file_exists
+    )
 
 
 def append_dropped_player(path: str, player_name: str):
     """Append a single dropped player to the dropped_players.csv file."""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    append_dropped_players(path, [player_name])
 
-    if not os.path.exists(path):
-        # Create new file with header
-        pd.DataFrame({'player_name': [player_name]}).to_csv(path, index=False)
-    else:
-        # Append without header
-        pd.DataFrame({'player_name': [player_name]}).to_csv(
-            path, index=False, mode="a", header=False
-        )
 
+# Guards the shared newly_dropped list across worker threads
+_DROPPED_LOCK = threading.Lock()
 
-def build_database(player_names):
-    """Build rows of (player_name, date, skills, bosses)."""
-    today = date.today().isoformat()
-    rows = []
 
-    for name in player_names:
-        print(f"Fetching: {name}…")
-        try:
-            stats = fetch_player_stats(name)
-        except ValueError as e:
-            # Handle "not on hiscores" (404) separately
-            if "not on hiscores" in str(e):
-                print(
-                    f"  [INFO] {name} is no longer on hiscores "
-                    f"(name change, derank, or ban). Marking as dropped."
-                )
-                append_dropped_player(DROPPED_PLAYERS_PATH, name)
-                # We don't raise, just skip this player for today
-                continue
-            else:
-                print(f"  [ERROR] {name}: {e}")
-                continue
-        except Exception as e:
-            # Other unexpected errors after retries
+def fetch_or_skip(name: str, newly_dropped: list):
+    """Fetch stats for one player; log and return None if it fails.
+
+    Players no longer on hiscores are added to newly_dropped.
+    """
+    try:
+        return fetch_player_stats(name)
+    except ValueError as e:
+        # Handle "not on hiscores" (404) separately
+        if "not on hiscores" in str(e):
+            print(
+                f"  [INFO] {name} is no longer on hiscores "
+                f"(name change, derank, or ban). Marking as dropped."
+            )
+            with _DROPPED_LOCK:
+                newly_dropped.append(name)
+        else:
             print(f"  [ERROR] {name}: {e}")
-            continue
+    except Exception as e:
+        # Other unexpected errors after retries
+        print(f"  [ERROR] {name}: {e}")
+    # We don't raise, just skip this player for today
+    return None
+
+
+def new_batch(size: int):
+    """Preallocate one array per output column for up to `size` players."""
+    names = []
+    skill_data = {col: np.zeros(size, dtype=np.int64) for col in SKILL_COLUMNS}
+    boss_data = {col: np.zeros(size, dtype=np.int64) for col in BOSS_COLUMNS}
+    boss_missing = {col: np.zeros(size, dtype=bool) for col in BOSS_COLUMNS}
+    return names, skill_data, boss_data, boss_missing
+
+
+def batch_to_frame(batch, today: str) -> pd.DataFrame:
+    """Wrap the filled part of a batch's arrays into a DataFrame."""
+    names, skill_data, boss_data, boss_missing = batch
+    rows = len(names)
+
+    columns = {"player_name": names, "date": [today] * rows}
+    for col in SKILL_COLUMNS:
+        columns[col] = skill_data[col][:rows]
+    for col in BOSS_COLUMNS:
+        columns[col] = pd.arrays.IntegerArray(
+            boss_data[col][:rows], boss_missing[col][:rows]
+        )
+
+    return pd.DataFrame(columns)
+
+
+def build_database(player_names, today: str | None = None, batch_size: int = BATCH_SIZE):
+    """Build rows of (player_name, date, skills, bosses).
+
+    Yields a DataFrame every `batch_size` players, so the caller can save
+    progress while the run is still going. `today` defaults to the
+    current date (ISO format).
+    """
+    today = today or date.today().isoformat()
+    newly_dropped = []
+
+    # One preallocated array per column, filled by row index
+    # (boss values can be missing → mask).
+    batch = new_batch(batch_size)
+
+    # Requests are I/O-bound, so fetch players concurrently.
+    # Rows are collected as fetches finish, so one slow player (e.g. stuck
+    # in retries) doesn't hold back the players queued behind it.
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    futures = {
+        executor.submit(fetch_or_skip, name, newly_dropped): name
+        for name in player_names
+    }
+
+    try:
+        for future in as_completed(futures):
+            # Drop our reference so each finished result can be freed
+            name = futures.pop(future)
+            stats = future.result()
+            if stats is None:
+                continue
 
-        row = {"player_name": name, "date": today}
+            names, skill_data, boss_data, boss_missing = batch
+            i = len(names)
+            names.append(name)
+
+            # Skills
+            for skill, level_col, xp_col, rank_col in SKILL_COLS:
+                vals = stats[skill]
+                skill_data[level_col][i] = vals["level"]
+                skill_data[xp_col][i] = vals["xp"]
+                skill_data[rank_col][i] = vals["rank"]
+
+            # Bosses
+            for boss, kc_col, rank_col in BOSS_COLS:
+                vals = stats["bosses"].get(boss, {"kc": None, "rank": None})
+                for col, value in ((kc_col, vals["kc"]), (rank_col, vals["rank"])):
+                    if value is None:
+                        boss_missing[col][i] = True
+                    else:
+                        boss_data[col][i] = value
+
+            if len(names) == batch_size:
+                yield batch_to_frame(batch, today)
+                batch = new_batch(batch_size)
+    finally:
+        # On Ctrl-C or a failed write, cancel the queued requests instead
+        # of waiting for every remaining player to be fetched
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Record newly dropped players with a single file write, even if
+        # the run was aborted
+        with _DROPPED_LOCK:
+            dropped_so_far = list(newly_dropped)
+        append_dropped_players(DROPPED_PLAYERS_PATH, dropped_so_far)
+
+    if batch[0]:
+        yield batch_to_frame(batch, today)
+
+
+def load_saved_players(path: str, day: str) -> set:
+    """Players that already have a row for `day` in the panel CSV."""
+    if not os.path.exists(path):
+        return set()
+    # RSNs can't contain commas, so only split off the first two fields
+    # instead of parsing all ~210 columns of every historical row
+    saved = set()
+    with open(path, encoding="utf-8") as f:
+        next(f, None)  # header
+        for line in f:
+            fields = line.split(",", 2)
+            if len(fields) > 2 and fields[1] == day:
+                saved.add(fields[0])
+    return saved
 
-        # Skills
-        for skill in SKILLS:
-            vals = stats[skill]
-            row[f"{skill}_level"] = vals["level"]
-            row[f"{skill}_xp"] = vals["xp"]
-            row[f"{skill}_rank"] = vals["rank"]
 
-        # Bosses
-        for boss in BOSSES:
-            vals = stats["bosses"].get(boss, {"kc": None, "rank": None})
-            row[f"{boss}_kc"] = vals["kc"]
-            row[f"{boss}_rank"] = vals["rank"]
+def append_rows_to_csv(path: str, df: pd.DataFrame):
+    """Append df to the panel CSV with csv.writer (header only for a new file)."""
+    file_exists = os.path.exists(path)
 
-        rows.append(row)
+    # Column-wise Python values; missing boss values become empty cells
+    columns = [df[col].to_numpy(dtype=object, na_value="") for col in HEADER_COLS]
 
-    return pd.DataFrame(rows)
+    with open(path, "a", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        if not file_exists:
+            writer.writerow(HEADER_COLS)
+        writer.writerows(zip(*columns))
 
 
 if __name__ == "__main__":
@@ -305,24 +499,34 @@ if __name__ == "__main__":
     dropped = load_dropped_players(DROPPED_PLAYERS_PATH)
     if dropped:
         print(f"Excluding {len(dropped)} dropped players (no longer on hiscores).")
-    player_names = [n for n in all_player_names if n not in dropped]
+    # dict.fromkeys drops repeated names (keeping list order), so nobody
+    # is fetched or saved twice
+    player_names = [n for n in dict.fromkeys(all_player_names) if n not in dropped]
     print(f"Tracking {len(player_names)} active players today.")
 
-    # 2. Build today's rows
-    df = build_database(player_names)
-
-    # 3. Append to panel CSV
+    # 1c. Skip players already saved today (resuming an interrupted run)
     os.makedirs(DATA_DIR, exist_ok=True)
     output_path = os.path.join(DATA_DIR, "players_stats_5k.csv")
 
-    file_exists = os.path.exists(output_path)
-
-    df.to_csv(
-        output_path,
-        index=False,
-        mode="a",
-        header=not file_exists,
-    )
+    # One date for the whole run, even if it crosses midnight
+    today = date.today().isoformat()
 
-    print(f"\n✔ Appended {len(df)} rows to {output_path}")
+    saved_today = load_saved_players(output_path, today)
+    if saved_today:
+        print(f"Skipping {len(saved_today)} players already saved today.")
+        player_names = [n for n in player_names if n not in saved_today]
+
+    # 2. Build today's rows and append them to the panel CSV batch by batch
+    appended = 0
+    batches = build_database(player_names, today)
+    try:
+        for df in batches:
+            append_rows_to_csv(output_path, df)
+            appended += len(df)
+            print(f"Saved {appended}/{len(player_names)} players…")
+    finally:
+        # Stop the fetch pool right away if we're interrupted here
+        batches.close()
+
+    print(f"\n✔ Appended {appended} rows to {output_path}")
     print("✔ Panel database updated.")
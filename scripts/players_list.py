@@ -1,9 +1,12 @@
 import csv
+import html
 import os
 import random
+import re
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
 # -------------------------------------------------------------------
@@ -51,11 +54,46 @@ SKILL_TABLES = {
 
 MAX_PAGE = 20000                 # random page between 1 and 20000
 TARGET_PER_SKILL = 2             # how many nicknames per skill
+REQUESTS_PER_SECOND = 2          # polite request rate to the hiscores
 
 HEADERS = {
     "User-Agent": "ThesisOSRS-Sampler/1.0 (contact@example.com)"
 }
 
+# Player links in hiscore rows, e.g. <a href="overall?user1=Lynx%A0Titan">Lynx Titan</a>
+NAME_LINK_RE = re.compile(r'<a href="[^"]*user1=[^"]*"[^>]*>([^<]+)</a>')
+
+# One keep-alive session for all page requests (no new TLS handshake per page)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=0),
+)
+_SESSION.headers.update(HEADERS)
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session (swap it out in tests)."""
+    return _SESSION
+
+
+# Earliest time (time.monotonic) the next page request may start
+_next_request_at = 0.0
+
+
+def wait_for_rate_limit():
+    """
+    Block until the next request is allowed (at most REQUESTS_PER_SECOND).
+    Time spent on the previous request counts toward the gap, unlike a
+    fixed sleep after every call.
+    """
+    global _next_request_at
+    now = time.monotonic()
+    if now < _next_request_at:
+        time.sleep(_next_request_at - now)
+        now = _next_request_at
+    _next_request_at = now + 1 / REQUESTS_PER_SECOND
+
 
 def load_existing_names(csv_path: str) -> set[str]:
     """
@@ -85,10 +123,18 @@ def fetch_page_names(table_index: int, page: int) -> list[str]:
     Returns a list of RSNs as strings.
     """
     params = {"table": table_index, "page": page}
-    resp = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=10)
+    wait_for_rate_limit()
+    resp = get_session().get(BASE_URL, params=params, timeout=10)
     resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    # Fast path: pull names straight out of the player links
+    names = [html.unescape(m).strip() for m in NAME_LINK_RE.findall(resp.text)]
+    names = [name for name in names if name]
+    if names:
+        return names
+
+    # Fallback (e.g. if the page layout changes): walk the table with BS4
+    soup = BeautifulSoup(resp.content, "lxml")
 
     # Find the main hiscore table (the one with player rows)
     table = soup.find("table")
@@ -96,7 +142,6 @@ def fetch_page_names(table_index: int, page: int) -> list[str]:
         return []
 
     rows = table.find_all("tr")
-    names: list[str] = []
 
     # Skip header row (first <tr>)
     for row in rows[1:]:
@@ -122,7 +167,8 @@ def sample_names_for_skill(
     For a given skill (table), sample up to `target` new names that are not in existing_names.
     Uses random pages in [1, MAX_PAGE].
     """
-    collected: list[str] = []
+    # dict keeps insertion order and gives O(1) membership checks
+    collected: dict[str, None] = {}
     attempts = 0
     max_attempts = 100  # safety to avoid infinite loops
 
@@ -139,28 +185,24 @@ def sample_names_for_skill(
             continue
 
         if not names_on_page:
-            time.sleep(0.5)
             continue
 
         random.shuffle(names_on_page)
 
         for name in names_on_page:
             if name not in existing_names and name not in collected:
-                collected.append(name)
+                collected[name] = None
                 print(f"  -> added {name}")
                 if len(collected) >= target:
                     break
 
-        # Be polite to the server
-        time.sleep(0.5)
-
     if len(collected) < target:
         print(
             f"[{skill}] Warning: only collected {len(collected)} names "
             f"after {attempts} attempts."
         )
 
-    return collected
+    return list(collected)
 
 
 def append_names_to_csv(csv_path: str, new_rows: list[dict], existing: bool):
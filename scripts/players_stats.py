@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote_plus
 import csv
 import pandas as pd
@@ -12,6 +13,23 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 
 HISCORES_URL = "https://secure.runescape.com/m=hiscore_oldschool/index_lite.ws?player={name}"
 
+# --- HTTP session ---------------------------------------------------
+
+# One keep-alive session for all hiscore requests, so each player
+# doesn't pay for a fresh TCP + TLS handshake.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=0),
+)
+_SESSION.headers.update({"User-Agent": "ThesisOSRS/1.0"})
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session (swap it out in tests)."""
+    return _SESSION
+
+
 SKILLS = [
     "overall",
     "attack",
@@ -116,7 +134,7 @@ def fetch_player_stats(player_name: str) -> dict:
     encoded = quote_plus(player_name)
     url = HISCORES_URL.format(name=encoded)
 
-    resp = requests.get(url, timeout=10)
+    resp = get_session().get(url, timeout=10)
     if resp.status_code == 404:
         raise ValueError(f"Player '{player_name}' not on hiscores.")
     resp.raise_for_status()
@@ -174,14 +192,20 @@ def load_player_names(csv_path: str) -> list:
             f"Make sure players_list.csv exists in the data/ folder."
         )
 
-    df_raw = pd.read_csv(csv_path, header=None)
+    # Detect headered vs headerless format from the first line only,
+    # so the file is parsed once
+    # (utf-8-sig drops a BOM; csv.reader handles quoted header cells)
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        first = next(csv.reader(f), [])
 
-    # Detect headered vs headerless format
-    if "player_name" in df_raw.iloc[0].values:
-        df = pd.read_csv(csv_path)
-        names = df["player_name"].astype(str).tolist()
+    if "player_name" in first:
+        df = pd.read_csv(csv_path, usecols=["player_name"], encoding="utf-8-sig")
     else:
-        names = df_raw.iloc[:, 0].astype(str).tolist()
+        df = pd.read_csv(
+            csv_path, header=None, names=["player_name"], usecols=[0],
+            encoding="utf-8-sig",
+        )
+    names = df["player_name"].astype(str).tolist()
 
     return [n.strip() for n in names if isinstance(n, str) and n.strip()]
 
@@ -224,7 +248,8 @@ if __name__ == "__main__":
     players_list_path = os.path.join(DATA_DIR, "players_list.csv")
     print(f"Using players list at: {players_list_path}")
 
-    player_names = load_player_names(players_list_path)
+    # dict.fromkeys drops repeated names (keeping list order)
+    player_names = list(dict.fromkeys(load_player_names(players_list_path)))
     print(f"Loaded {len(player_names)} players.")
 
     # 2. Build today's rows